@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine, Column, Integer, String, JSON, DateTime
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, JSON, DateTime, Index, LargeBinary
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -18,14 +19,80 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+def dialect_insert(bind):
+    """
+    Returns the dialect-specific insert() construct, which supports
+    ON CONFLICT upserts on both PostgreSQL and SQLite.
+    """
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
 class PublicPlant(Base):
     __tablename__ = "public_plants"
 
     id = Column(Integer, primary_key=True, index=True)
-    filename = Column(String, index=True)
+    filename = Column(String)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     
     # Store the full AI result as a JSON blob
     # In a real app we might normalize this, but for this use-case 
     # we just want to render it exactly like the frontend expects.
     data = Column(JSON)
+
+    # `data` pre-encoded once at write time so listings can be built by
+    # concatenating bytes. NULL for unknown identifications, which are never
+    # listed, and for rows written before the column existed.
+    data_json = Column(LargeBinary, nullable=True)
+
+    # The only index on filename; bulk imports upsert on it. Databases created
+    # before it existed keep their old ix_public_plants_filename and get this
+    # one from scripts/import_local_data.py.
+    __table_args__ = (
+        Index("uq_public_plants_filename", "filename", unique=True),
+    )
+
+
+class PlantStat(Base):
+    __tablename__ = "plant_stats"
+
+    # One row per (dimension, value) pair, e.g. ("plant_type", "Succulent").
+    # Kept in step with public_plants by backend.services.stats so that
+    # /api/stats never has to scan the plants table.
+    dimension = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    # Lets the top-species query read the first rows instead of sorting them all
+    __table_args__ = (
+        Index("ix_plant_stats_dimension_count", "dimension", "count"),
+    )
+
+
+def ensure_schema():
+    """
+    Adds columns introduced after a database was created, since create_all
+    only creates missing tables.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns(PublicPlant.__tablename__)}
+    if "data_json" not in columns:
+        column_type = PublicPlant.__table__.c.data_json.type.compile(dialect=engine.dialect)
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {PublicPlant.__tablename__} ADD COLUMN data_json {column_type}"))
+
+
+def init_db():
+    """
+    Creates missing tables and columns. Safe to run repeatedly; production
+    start runs it once before forking workers.
+    """
+    Base.metadata.create_all(bind=engine)
+    ensure_schema()
+
+
+def check_connection():
+    """
+    Round-trips a trivial query. Raises if the database is unreachable.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
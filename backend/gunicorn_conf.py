@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for production (`python start.py --prod`).
+Values come from the environment so start.py and systemd can override them.
+"""
+import os
+import multiprocessing
+
+bind = f"{os.getenv('BACKEND_HOST', '127.0.0.1')}:{os.getenv('BACKEND_PORT', '8001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once in the master so workers share its code pages (copy-on-write)
+preload_app = os.getenv("PRELOAD_APP", "0") == "1"
+
+# Uploads wait on the AI call; let them finish on SIGTERM / SIGHUP before killing a worker
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "120"))
+timeout = graceful_timeout + 30
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared across processes
+    if preload_app:
+        from backend.database import engine
+        engine.dispose(close=False)
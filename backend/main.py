@@ -1,14 +1,22 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Header, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from sqlalchemy import case
 from sqlalchemy.orm import Session
+import asyncio
 import shutil
 import os
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
 
-from backend.database import engine, Base, SessionLocal, PublicPlant
+from backend.database import engine, SessionLocal, PublicPlant, init_db, check_connection
 from backend.services.identifier import identify_plant_from_file
+from backend.services.stats import record_plant, get_stats
+from backend.services.serialization import listing_json, json_array_response
+from backend.services.uploads import ImmutableUploads, make_webp_variant
+from backend.services.feed import feed
 
 # Lambda & Cloud imports
 try:
@@ -17,13 +25,37 @@ except ImportError:
     Mangum = None
 import boto3
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Create DB tables (production start runs this once before the workers;
+# a database that is briefly down must not stop the app from importing)
+try:
+    init_db()
+except Exception as e:
+    print(f"Database initialisation failed: {e}")
+
+# Startup/shutdown for long-running servers (uvicorn/gunicorn) only; Mangum
+# would run these around every Lambda invocation, so it is built with lifespan="off"
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the first pooled connection before the worker takes traffic. A
+    # database that is down at boot must not stop the worker; /readyz reports it.
+    try:
+        check_connection()
+    except Exception as e:
+        print(f"Database not reachable at startup: {e}")
+    await feed.start()
+    yield
+    # Runs after the server has drained in-flight requests (e.g. uploads)
+    await feed.stop()
+    engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 if Mangum:
-    handler = Mangum(app)
+    handler = Mangum(app, lifespan="off")
+
+# Mangum buffers whole responses, so there is no SSE on Lambda; the list
+# endpoint tells the page whether to subscribe or keep re-fetching
+LIVE_FEED = not os.getenv("AWS_LAMBDA_FUNCTION_NAME")
 
 # Enable CORS (since frontend is on :8000 and backend on :8001)
 app.add_middleware(
@@ -32,14 +64,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Last-Plant-Id", "X-Live-Feed"],
 )
 
 # Uploads directory
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Mount uploads dir to serve images
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+# Mount uploads dir to serve images (immutable caching, strong ETags, WebP negotiation)
+app.mount("/uploads", ImmutableUploads(directory=UPLOAD_DIR), name="uploads")
 
 # Dependency
 def get_db():
@@ -49,6 +82,41 @@ def get_db():
     finally:
         db.close()
 
+@app.get("/healthz")
+def healthz():
+    """
+    Liveness: the worker process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    """
+    Readiness: the worker can reach the database.
+    """
+    try:
+        check_connection()
+    except Exception as e:
+        print(f"Readiness check failed: {e}")
+        raise HTTPException(status_code=503, detail="Database unavailable.")
+    return {"status": "ready"}
+
+def save_public_plant(db: Session, filename: str, plant_data: dict) -> PublicPlant:
+    """
+    Inserts a public plant and counts it, in one transaction.
+    """
+    db_plant = PublicPlant(
+        filename=filename,
+        data=plant_data,
+        data_json=listing_json(plant_data)
+    )
+    db.add(db_plant)
+    # Keep /api/stats counters in the same transaction as the insert
+    record_plant(db, plant_data)
+    db.commit()
+    db.refresh(db_plant)
+    return db_plant
+
 @app.post("/api/upload")
 async def upload_plant(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """
@@ -87,8 +155,9 @@ async def upload_plant(file: UploadFile = File(...), db: Session = Depends(get_d
         with open(file_path, "wb") as buffer:
             buffer.write(file_content)
             
-        # 2. Run AI Identification
-        plant_data = identify_plant_from_file(file_path)
+        # 2. Run AI Identification (a blocking API call; keep it off the event
+        # loop so live feed streams on this worker keep flowing)
+        plant_data = await asyncio.to_thread(identify_plant_from_file, file_path)
         
         # 3. Augment Data (set reference image to the public URL)
         bucket_name = os.getenv("BUCKET_NAME")
@@ -96,12 +165,14 @@ async def upload_plant(file: UploadFile = File(...), db: Session = Depends(get_d
         if bucket_name:
             # S3 Upload
             s3 = boto3.client('s3')
-            s3.upload_file(file_path, bucket_name, unique_filename)
+            await asyncio.to_thread(s3.upload_file, file_path, bucket_name, unique_filename)
             file_url = f"https://{bucket_name}.s3.amazonaws.com/{unique_filename}"
             # Clean up local temp file
             os.remove(file_path)
         else:
             # Local Upload
+            # Encoding takes ~1s on full-size photos; keep it off the event loop
+            await asyncio.to_thread(make_webp_variant, file_path)
             base_url = os.getenv('BASE_URL', 'http://localhost:8001')
             file_url = f"{base_url}/uploads/{unique_filename}"
 
@@ -120,13 +191,9 @@ async def upload_plant(file: UploadFile = File(...), db: Session = Depends(get_d
         
         # 5. Save to Database (ONLY if not unknown)
         if plant_data.get("identified_name", "").lower() != "unknown":
-            db_plant = PublicPlant(
-                filename=unique_filename,
-                data=plant_data
-            )
-            db.add(db_plant)
-            db.commit()
-            db.refresh(db_plant)
+            db_plant = await asyncio.to_thread(save_public_plant, db, unique_filename, plant_data)
+            # Push to /api/public-plants/stream clients on this worker
+            feed.publish(db_plant.id, db_plant.data_json)
         
         return plant_data
 
@@ -145,10 +212,57 @@ async def upload_plant(file: UploadFile = File(...), db: Session = Depends(get_d
 def get_public_plants(db: Session = Depends(get_db)):
     """
     Returns list of all public plants, excluding "unknown" identifications.
+    Built from the pre-encoded data_json bytes, so no JSON is decoded or re-encoded.
+    X-Last-Plant-Id is the newest id included, for resuming the live stream;
+    X-Live-Feed is "1" when /api/public-plants/stream is available.
+    """
+    # Only rows without data_json pay for decoding `data`
+    legacy_data = case((PublicPlant.data_json.is_(None), PublicPlant.data))
+    rows = db.query(PublicPlant.id, PublicPlant.data_json, legacy_data).order_by(PublicPlant.uploaded_at.desc())
+    items = []
+    last_id = 0
+    for plant_id, data_json, data in rows:
+        last_id = max(last_id, plant_id)
+        if data_json is not None:
+            items.append(data_json)
+        else:
+            # Rows not yet backfilled (scripts/backfill_data_json.py)
+            encoded = listing_json(data)
+            if encoded is not None:
+                items.append(encoded)
+    response = json_array_response(items)
+    response.headers["X-Last-Plant-Id"] = str(last_id)
+    response.headers["X-Live-Feed"] = "1" if LIVE_FEED else "0"
+    return response
+
+@app.get("/api/public-plants/stream")
+async def stream_public_plants(
+    request: Request,
+    last_event_id: Optional[int] = Header(None),
+    after: Optional[int] = None,
+):
+    """
+    Server-Sent Events feed of newly added public plants. Each event's id is the
+    plant id, so a reconnecting EventSource resumes from Last-Event-ID. `after`
+    sets the starting point for the first connection (e.g. X-Last-Plant-Id from
+    the list), since EventSource cannot send headers itself. Answers 204 where
+    streaming is unavailable (Lambda), which tells EventSource not to reconnect.
+    """
+    if not LIVE_FEED:
+        return Response(status_code=204)
+    return StreamingResponse(
+        feed.stream(request, last_event_id if last_event_id is not None else after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/stats")
+def get_catalogue_stats(top: int = 10, db: Session = Depends(get_db)):
+    """
+    Returns counts by plant_type, environment, difficulty and edible/toxic flags,
+    plus the `top` most common species. Served from the plant_stats aggregate table.
     """
-    plants = db.query(PublicPlant).order_by(PublicPlant.uploaded_at.desc()).all()
-    # Filter out any existing unknown entries in Python for simplicity
-    return [p.data for p in plants if p.data.get("identified_name", "").lower() != "unknown"]
+    return get_stats(db, top=max(0, min(top, 100)))
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,198 @@
+import os
+import time
+import asyncio
+from collections import deque
+
+from sqlalchemy import case, func
+
+from backend.database import SessionLocal, PublicPlant
+from backend.services.serialization import listing_json
+
+# Other workers' inserts are picked up by polling the table this often
+POLL_INTERVAL = float(os.getenv("FEED_POLL_INTERVAL", "2"))
+# Comment line sent on idle streams so proxies keep the connection open
+HEARTBEAT_INTERVAL = 15
+# Streams end after this long; EventSource reconnects with Last-Event-ID, so
+# nothing is lost, and graceful shutdowns are not held up by open streams
+MAX_STREAM_SECONDS = float(os.getenv("FEED_MAX_STREAM_SECONDS", "60"))
+# Events buffered per client before a slow client is disconnected
+QUEUE_SIZE = 256
+# Rows fetched per query when replaying or polling
+REPLAY_LIMIT = 500
+# Ids are assigned at insert but become visible at commit, so a lower id can
+# appear after a higher one; each poll re-scans this many ids behind its cursor
+POLL_WINDOW = 100
+# Recently published ids remembered so local and polled copies are sent once
+DEDUP_SIZE = 1024
+
+
+def fetch_plants_after(after_id, limit=REPLAY_LIMIT):
+    """
+    Returns ([(id, encoded json)], next_after) for listable plants with
+    id > after_id, oldest first. next_after is the last id read when the page
+    was full, or None once there are no more rows.
+    """
+    db = SessionLocal()
+    try:
+        legacy_data = case((PublicPlant.data_json.is_(None), PublicPlant.data))
+        rows = (
+            db.query(PublicPlant.id, PublicPlant.data_json, legacy_data)
+            .filter(PublicPlant.id > after_id)
+            .order_by(PublicPlant.id)
+            .limit(limit)
+            .all()
+        )
+        events = []
+        for plant_id, data_json, data in rows:
+            encoded = data_json if data_json is not None else listing_json(data)
+            if encoded is not None:
+                events.append((plant_id, bytes(encoded)))
+        return events, (rows[-1][0] if len(rows) == limit else None)
+    finally:
+        db.close()
+
+
+async def iter_plants_after(after_id):
+    """
+    Yields every listable plant with id > after_id, one page per query.
+    """
+    while after_id is not None:
+        events, after_id = await asyncio.to_thread(fetch_plants_after, after_id)
+        for event in events:
+            yield event
+
+
+def latest_plant_id():
+    db = SessionLocal()
+    try:
+        return db.query(func.max(PublicPlant.id)).scalar() or 0
+    finally:
+        db.close()
+
+
+def format_event(plant_id, payload: bytes) -> bytes:
+    return b"id: %d\nevent: plant\ndata: %s\n\n" % (plant_id, payload)
+
+
+class PlantFeed:
+    """
+    Per-worker fan-out of newly committed plants to SSE subscribers.
+
+    Uploads handled by this worker are published directly after commit; a
+    background poller picks up rows committed by other workers. Each
+    subscriber owns a bounded queue, so publishing is a non-blocking
+    put_nowait per client and never waits on a slow connection.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        # Cursor for the poller only; local publishes may run ahead of it.
+        # Set when the first subscriber arrives and cleared when the last one
+        # leaves, so an idle feed sends no queries and the database can sleep.
+        self.poll_id = None
+        # Where the cursor started; the re-scan window never reaches below it
+        self.poll_floor = 0
+        self._published = set()
+        self._published_order = deque()
+        self._poller = None
+
+    async def start(self):
+        # No query here: the cursor is read when someone subscribes, so a
+        # database that is down at boot does not stop the worker
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._poller:
+            self._poller.cancel()
+            self._poller = None
+        for queue in list(self.subscribers):
+            self._close(queue)
+
+    def publish(self, plant_id, payload: bytes):
+        """
+        Sends one plant to every subscriber. Must run on the event loop thread.
+        """
+        if plant_id in self._published:
+            return
+        self._published.add(plant_id)
+        self._published_order.append(plant_id)
+        if len(self._published_order) > DEDUP_SIZE:
+            self._published.discard(self._published_order.popleft())
+
+        event = (plant_id, format_event(plant_id, payload))
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Drop the client; it reconnects and catches up via Last-Event-ID
+                self._close(queue)
+
+    def _close(self, queue):
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            if self.poll_id is None:
+                continue
+            try:
+                # Plants already sent are skipped by publish()
+                async for plant_id, payload in iter_plants_after(max(self.poll_floor, self.poll_id - POLL_WINDOW)):
+                    if self.poll_id is None:
+                        break
+                    self.poll_id = max(self.poll_id, plant_id)
+                    self.publish(plant_id, payload)
+            except Exception as e:
+                print(f"Feed poll failed: {e}")
+
+    async def stream(self, request, last_event_id=None):
+        """
+        Yields SSE frames: a replay of plants after last_event_id, then live events.
+        """
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        latest = await asyncio.to_thread(latest_plant_id)
+        if self.poll_id is None:
+            # First subscriber: the poller starts from here
+            self.poll_id = self.poll_floor = latest
+        # Subscribe before replaying so nothing committed meanwhile is missed
+        self.subscribers.add(queue)
+        try:
+            if last_event_id is None:
+                # Give a fresh client a resume point straight away, so a
+                # reconnect after a quiet stream still sends Last-Event-ID
+                yield b"retry: 1000\nid: %d\n\n" % latest
+            else:
+                yield b"retry: 1000\n\n"
+
+            # Live events for these were already sent by the replay
+            replayed = set()
+            if last_event_id is not None:
+                async for plant_id, payload in iter_plants_after(last_event_id):
+                    yield format_event(plant_id, payload)
+                    replayed.add(plant_id)
+
+            deadline = time.monotonic() + MAX_STREAM_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=min(HEARTBEAT_INTERVAL, remaining))
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if event is None:
+                    break
+                plant_id, frame = event
+                if plant_id not in replayed:
+                    yield frame
+        finally:
+            self.subscribers.discard(queue)
+            if not self.subscribers:
+                self.poll_id = None
+
+
+feed = PlantFeed()
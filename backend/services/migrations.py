@@ -0,0 +1,203 @@
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, true, update
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, PublicPlant
+from backend.services.serialization import listing_json
+
+# Checkpoints live outside the data so re-runs resume where they stopped
+STATE_DIR = os.getenv("MIGRATION_STATE_DIR", ".migrations")
+
+
+def add_runner_arguments(parser):
+    """
+    Adds the flags shared by every migration script to an argparse parser.
+    """
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows or files per committed batch (default 500).")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing anything.")
+    parser.add_argument("--reset", action="store_true", help="Ignore the saved checkpoint and start from the beginning.")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for file migrations (default 1).")
+    return parser
+
+
+def _checkpoint_path(name):
+    return os.path.join(STATE_DIR, f"{name}.json")
+
+
+def load_checkpoint(name):
+    try:
+        with open(_checkpoint_path(name), "r") as f:
+            return json.load(f).get("last_key")
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(name, last_key):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = _checkpoint_path(name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"last_key": last_key, "updated_at": time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(name):
+    try:
+        os.remove(_checkpoint_path(name))
+    except FileNotFoundError:
+        pass
+
+
+def run_db_migration(name, transform, batch_size=500, dry_run=False, reset=False, where=None,
+                     session_factory=SessionLocal):
+    """
+    Applies `transform(data) -> dict | None` to every PublicPlant.data blob.
+
+    Rows are read in primary-key order, `batch_size` at a time, and each batch
+    is committed on its own with the last id saved as a checkpoint. Returning
+    None from `transform` leaves the row untouched, and `where` optionally
+    narrows the rows visited. Written rows get data_json re-encoded too.
+    Returns (scanned, updated).
+
+    Does not touch plant_stats; run scripts/rebuild_stats.py if a transform
+    changes a counted field.
+    """
+    # A dry run writes nothing, so --reset only ignores the saved checkpoint
+    if reset and not dry_run:
+        clear_checkpoint(name)
+    last_id = (None if reset else load_checkpoint(name)) or 0
+    if last_id:
+        print(f"[{name}] Resuming after id {last_id}")
+
+    scanned = 0
+    updated = 0
+    db: Session = session_factory()
+    try:
+        while True:
+            stmt = (
+                select(PublicPlant.id, PublicPlant.data)
+                .where(PublicPlant.id > last_id)
+                .where(where if where is not None else true())
+                .order_by(PublicPlant.id)
+                .limit(batch_size)
+                .execution_options(yield_per=batch_size)
+            )
+            changes = []
+            batch_count = 0
+            for plant_id, data in db.execute(stmt):
+                batch_count += 1
+                last_id = plant_id
+                new_data = transform(dict(data or {}))
+                if new_data is not None:
+                    changes.append({"id": plant_id, "data": new_data, "data_json": listing_json(new_data)})
+
+            if batch_count == 0:
+                break
+
+            scanned += batch_count
+            updated += len(changes)
+            if dry_run:
+                db.rollback()
+            else:
+                if changes:
+                    db.execute(update(PublicPlant), changes)
+                db.commit()
+                save_checkpoint(name, last_id)
+            print(f"[{name}] {scanned} scanned, {updated} {'would change' if dry_run else 'updated'} (id <= {last_id})")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if not dry_run:
+        clear_checkpoint(name)
+    return scanned, updated
+
+
+def _migrate_file(args):
+    """
+    Transforms one file. Errors are returned rather than raised so a single
+    bad file does not abort the rest of its batch.
+    """
+    transform, path, dry_run = args
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        new_data = transform(data)
+        if new_data is None:
+            return False
+        if not dry_run:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(new_data, f, indent=2)
+            os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        return e
+
+
+def run_file_migration(name, transform, data_dir="data", skip=("index.json", "all_plants.json"),
+                       batch_size=500, dry_run=False, reset=False, workers=1):
+    """
+    Applies `transform(data) -> dict | None` to every JSON file in `data_dir`.
+
+    Files are visited in name order and checkpointed after each batch by the
+    last filename. Each file is rewritten atomically. With workers > 1 a batch
+    is spread over a process pool, so `transform` must be a module-level
+    function. The checkpoint never moves past a file that failed, so a re-run
+    retries it. Returns (scanned, updated, failed).
+    """
+    # A dry run writes nothing, so --reset only ignores the saved checkpoint
+    if reset and not dry_run:
+        clear_checkpoint(name)
+    last_name = (None if reset else load_checkpoint(name)) or ""
+    if last_name:
+        print(f"[{name}] Resuming after {last_name}")
+
+    filenames = sorted(
+        f for f in os.listdir(data_dir)
+        if f.endswith(".json") and f not in skip and f > last_name
+    )
+
+    scanned = 0
+    updated = 0
+    failed = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for start in range(0, len(filenames), batch_size):
+            batch = filenames[start:start + batch_size]
+            jobs = [(transform, os.path.join(data_dir, f), dry_run) for f in batch]
+            if pool:
+                results = pool.map(_migrate_file, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+            else:
+                results = map(_migrate_file, jobs)
+
+            # Last file of an unbroken run of successes since the checkpoint
+            completed = None
+            for filename, result in zip(batch, results):
+                scanned += 1
+                if isinstance(result, Exception):
+                    failed += 1
+                    print(f"Error processing {filename}: {result}")
+                    continue
+                if result is True:
+                    updated += 1
+                if not failed:
+                    completed = filename
+
+            if not dry_run and completed:
+                save_checkpoint(name, completed)
+            print(f"[{name}] {scanned} scanned, {updated} {'would change' if dry_run else 'updated'} (through {batch[-1]})")
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if not dry_run and not failed:
+        clear_checkpoint(name)
+    return scanned, updated, failed
+
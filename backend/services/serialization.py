@@ -0,0 +1,35 @@
+import json
+
+from fastapi.responses import Response
+
+# orjson is several times faster than the stdlib encoder; fall back cleanly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Encodes obj as compact UTF-8 JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def listing_json(plant_data: dict):
+    """
+    Returns the bytes stored in PublicPlant.data_json, or None for plants that
+    are never listed (unknown identifications).
+    """
+    if (plant_data or {}).get("identified_name", "").lower() == "unknown":
+        return None
+    return dumps(plant_data)
+
+
+def json_array_response(items) -> Response:
+    """
+    Builds a JSON array response by concatenating already-encoded elements.
+    """
+    return Response(content=b"[" + b",".join(items) + b"]", media_type="application/json")
@@ -0,0 +1,117 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from backend.database import PlantStat, PublicPlant, dialect_insert
+
+# Categorical fields that get their own breakdown in /api/stats
+CATEGORY_FIELDS = ["plant_type", "environment", "difficulty"]
+FLAG_FIELDS = ["is_edible", "is_toxic_to_pets"]
+
+TOTAL_DIMENSION = "total"
+SPECIES_DIMENSION = "species"
+
+
+def _flag_value(value) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return "unknown"
+
+
+def stat_keys(plant_data: dict) -> list:
+    """
+    Returns the (dimension, value) pairs a single plant contributes to.
+    """
+    keys = [(TOTAL_DIMENSION, "all")]
+
+    for field in CATEGORY_FIELDS:
+        value = (plant_data.get(field) or "").strip()
+        keys.append((field, value or "unknown"))
+
+    for field in FLAG_FIELDS:
+        keys.append((field, _flag_value(plant_data.get(field))))
+
+    species = plant_data.get("scientific_name") or plant_data.get("identified_name")
+    if species:
+        keys.append((SPECIES_DIMENSION, species.strip()))
+
+    return keys
+
+
+def increment_stats(db: Session, keys: list, amount: int = 1):
+    """
+    Adds `amount` to each (dimension, value) counter with a single upsert.
+    Does not commit, so it joins the caller's transaction.
+    """
+    if not keys:
+        return
+
+    insert = dialect_insert(db.get_bind())
+    stmt = insert(PlantStat).values(
+        [{"dimension": d, "value": v, "count": amount} for d, v in keys]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlantStat.dimension, PlantStat.value],
+        set_={"count": PlantStat.count + stmt.excluded.count},
+    )
+    db.execute(stmt)
+
+
+def record_plant(db: Session, plant_data: dict):
+    """
+    Counts a newly inserted public plant. Call before the insert's commit.
+    """
+    increment_stats(db, stat_keys(plant_data))
+
+
+def rebuild_stats(db: Session) -> int:
+    """
+    Recomputes every counter from public_plants. Returns the plant count.
+    """
+    counts = {}
+    total = 0
+    query = db.query(PublicPlant.data).execution_options(yield_per=500)
+    for (data,) in query:
+        data = data or {}
+        if data.get("identified_name", "").lower() == "unknown":
+            continue
+        total += 1
+        for key in stat_keys(data):
+            counts[key] = counts.get(key, 0) + 1
+
+    db.execute(delete(PlantStat))
+    if counts:
+        db.execute(
+            PlantStat.__table__.insert(),
+            [{"dimension": d, "value": v, "count": c} for (d, v), c in counts.items()],
+        )
+    db.commit()
+    return total
+
+
+def get_stats(db: Session, top: int = 10) -> dict:
+    """
+    Reads the aggregate table into the /api/stats response shape.
+    """
+    result = {"total": 0, "top_species": []}
+    for field in CATEGORY_FIELDS + FLAG_FIELDS:
+        result[field] = {}
+
+    for row in db.query(PlantStat).filter(PlantStat.dimension != SPECIES_DIMENSION):
+        if row.dimension == TOTAL_DIMENSION:
+            result["total"] = row.count
+        elif row.dimension in result:
+            result[row.dimension][row.value] = row.count
+
+    # Species grow with the catalogue, so only the top rows leave the database
+    top_species = (
+        db.query(PlantStat.value, PlantStat.count)
+        .filter(PlantStat.dimension == SPECIES_DIMENSION)
+        .order_by(PlantStat.count.desc(), PlantStat.value)
+        .limit(top)
+    )
+    result["top_species"] = [
+        {"scientific_name": value, "count": count} for value, count in top_species
+    ]
+    return result
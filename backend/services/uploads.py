@@ -0,0 +1,87 @@
+import os
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# Upload names are UUIDs and the bytes never change, so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Originals that may have a <stem>.webp sibling served to browsers that accept it
+WEBP_SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+WEBP_QUALITY = 80
+
+
+def webp_variant_path(path):
+    stem, ext = os.path.splitext(path)
+    if ext.lower() not in WEBP_SOURCE_EXTENSIONS:
+        return None
+    return stem + ".webp"
+
+
+def make_webp_variant(path):
+    """
+    Writes a WebP copy next to an uploaded JPEG/PNG. Returns the variant path,
+    or None if Pillow is missing, the source is already WebP, encoding fails,
+    or the WebP would not be smaller than the original.
+    """
+    variant_path = webp_variant_path(path)
+    if Image is None or variant_path is None:
+        return None
+    if os.path.exists(variant_path):
+        return variant_path
+    tmp_path = variant_path + ".tmp"
+    try:
+        with Image.open(path) as img:
+            icc_profile = img.info.get("icc_profile")
+            # WebP output carries no EXIF, so bake the camera rotation into the pixels
+            img = ImageOps.exif_transpose(img)
+            img.save(tmp_path, format="WEBP", quality=WEBP_QUALITY, method=4, icc_profile=icc_profile)
+        if os.path.getsize(tmp_path) >= os.path.getsize(path):
+            os.remove(tmp_path)
+            return None
+        os.replace(tmp_path, variant_path)
+        return variant_path
+    except Exception as e:
+        print(f"Warning: Failed to create WebP variant for {path}: {e}")
+        # Don't leave a partial file behind in the publicly served directory
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        return None
+
+
+class ImmutableUploads(StaticFiles):
+    """
+    StaticFiles for UUID-named uploads: long-lived immutable Cache-Control,
+    strong ETags derived from the file name and size, and transparent WebP
+    negotiation on Accept. Range requests are handled by FileResponse.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        headers = {"cache-control": IMMUTABLE_CACHE_CONTROL}
+
+        variant_path = webp_variant_path(str(full_path))
+        if variant_path is not None:
+            # Either representation may be chosen, so shared caches must key on Accept
+            headers["vary"] = "Accept"
+            if "image/webp" in request_headers.get("accept", ""):
+                try:
+                    stat_result = os.stat(variant_path)
+                    full_path = variant_path
+                except FileNotFoundError:
+                    pass
+
+        headers["etag"] = f'"{os.path.basename(full_path)}-{stat_result.st_size}"'
+
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,37 @@
+import os
+import sys
+import argparse
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.database import PublicPlant, ensure_schema
+from backend.services.migrations import add_runner_arguments, run_db_migration
+
+parser = add_runner_arguments(argparse.ArgumentParser(description="Pre-encode PublicPlant.data into data_json for fast listings."))
+
+def keep_data(data):
+    # The runner re-encodes data_json for every row it writes
+    if data.get("identified_name", "").lower() == "unknown":
+        return None
+    return data
+
+def backfill():
+    args = parser.parse_args()
+    ensure_schema()
+    try:
+        _, updated_count = run_db_migration(
+            "backfill_data_json",
+            keep_data,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            reset=args.reset,
+            where=PublicPlant.data_json.is_(None),
+        )
+        verb = "Would encode" if args.dry_run else "Successfully encoded"
+        print(f"{verb} {updated_count} plants.")
+    except Exception as e:
+        print(f"Error during backfill (re-run to resume from the last checkpoint): {e}")
+
+if __name__ == "__main__":
+    backfill()
@@ -1,9 +1,17 @@
 import os
-import json
+import sys
+import argparse
 import urllib.parse
 
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.migrations import add_runner_arguments, run_file_migration
+
 DATA_DIR = "data"
 
+parser = add_runner_arguments(argparse.ArgumentParser(description="Backfill Wikipedia URLs in local JSON files."))
+
 def generate_wiki_url(plant_data):
     wiki_name = plant_data.get("scientific_name") or plant_data.get("identified_name")
     if wiki_name:
@@ -11,26 +19,31 @@ def generate_wiki_url(plant_data):
         return f"https://en.wikipedia.org/wiki/{encoded_name}"
     return None
 
+def add_wiki_url(plant_data):
+    if "wiki_url" in plant_data:
+        return None
+    url = generate_wiki_url(plant_data)
+    if not url:
+        return None
+    plant_data["wiki_url"] = url
+    return plant_data
+
 def backfill_local_data():
-    updated_count = 0
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith(".json") and filename != "index.json" and filename != "all_plants.json":
-            filepath = os.path.join(DATA_DIR, filename)
-            try:
-                with open(filepath, "r") as f:
-                    plant_data = json.load(f)
-                
-                if "wiki_url" not in plant_data:
-                    url = generate_wiki_url(plant_data)
-                    if url:
-                        plant_data["wiki_url"] = url
-                        with open(filepath, "w") as f:
-                            json.dump(plant_data, f, indent=2)
-                        updated_count += 1
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
-    
-    print(f"Successfully backfilled {updated_count} local JSON files.")
+    args = parser.parse_args()
+    _, updated_count, failed_count = run_file_migration(
+        "backfill_local_wiki",
+        add_wiki_url,
+        data_dir=DATA_DIR,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        reset=args.reset,
+        workers=args.workers,
+    )
+    verb = "Would backfill" if args.dry_run else "Successfully backfilled"
+    print(f"{verb} {updated_count} local JSON files.")
+    if failed_count:
+        print(f"{failed_count} files failed; re-run to retry them from the last checkpoint.")
+        sys.exit(1)
 
 if __name__ == "__main__":
     backfill_local_data()
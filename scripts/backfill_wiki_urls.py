@@ -1,31 +1,39 @@
 import os
+import sys
+import argparse
 import urllib.parse
-from sqlalchemy.orm import Session
-from backend.database import SessionLocal, PublicPlant
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.migrations import add_runner_arguments, run_db_migration
+
+parser = add_runner_arguments(argparse.ArgumentParser(description="Backfill Wikipedia URLs on public plants."))
+
+def add_wiki_url(data):
+    if "wiki_url" in data:
+        return None
+    wiki_name = data.get("scientific_name") or data.get("identified_name")
+    if not wiki_name:
+        return None
+    encoded_name = urllib.parse.quote(wiki_name.replace(" ", "_"))
+    data["wiki_url"] = f"https://en.wikipedia.org/wiki/{encoded_name}"
+    return data
 
 def backfill():
-    db: Session = SessionLocal()
+    args = parser.parse_args()
     try:
-        plants = db.query(PublicPlant).all()
-        updated_count = 0
-        
-        for plant in plants:
-            data = dict(plant.data or {})
-            if "wiki_url" not in data:
-                wiki_name = data.get("scientific_name") or data.get("identified_name")
-                if wiki_name:
-                    encoded_name = urllib.parse.quote(wiki_name.replace(" ", "_"))
-                    data["wiki_url"] = f"https://en.wikipedia.org/wiki/{encoded_name}"
-                    plant.data = data
-                    updated_count += 1
-        
-        db.commit()
-        print(f"Successfully backfilled {updated_count} plants with Wikipedia URLs.")
+        _, updated_count = run_db_migration(
+            "backfill_wiki_urls",
+            add_wiki_url,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            reset=args.reset,
+        )
+        verb = "Would backfill" if args.dry_run else "Successfully backfilled"
+        print(f"{verb} {updated_count} plants with Wikipedia URLs.")
     except Exception as e:
-        print(f"Error during backfill: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        print(f"Error during backfill (re-run to resume from the last checkpoint): {e}")
 
 if __name__ == "__main__":
     backfill()
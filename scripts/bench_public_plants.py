@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+parser = argparse.ArgumentParser(description="Benchmark CPU per /api/public-plants request, pre-encoded vs legacy.")
+parser.add_argument("--plants", type=int, default=2000, help="Rows to load into the scratch database (default 2000).")
+parser.add_argument("--requests", type=int, default=20, help="Requests to time per implementation (default 20).")
+args = parser.parse_args()
+
+# Point the backend at a scratch database before it is imported
+scratch_dir = tempfile.mkdtemp(prefix="plant-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch_dir, 'bench.db')}"
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from backend.database import engine, Base, SessionLocal, PublicPlant
+from backend.services.serialization import listing_json, orjson
+from backend.main import get_public_plants
+
+DATA_DIR = "data"
+
+def legacy_get_public_plants(db):
+    # The implementation before data_json, plus FastAPI's default encoding
+    plants = db.query(PublicPlant).order_by(PublicPlant.uploaded_at.desc()).all()
+    result = [p.data for p in plants if p.data.get("identified_name", "").lower() != "unknown"]
+    return JSONResponse(content=jsonable_encoder(result)).body
+
+def load_samples():
+    samples = []
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if filename.endswith(".json") and filename not in ("index.json", "all_plants.json"):
+            with open(os.path.join(DATA_DIR, filename), "r") as f:
+                samples.append(json.load(f))
+    return samples
+
+def populate(count):
+    Base.metadata.create_all(bind=engine)
+    samples = load_samples()
+    rows = []
+    for i in range(count):
+        data = samples[i % len(samples)]
+        rows.append({"filename": f"bench-{i}.jpg", "data": data, "data_json": listing_json(data)})
+    with engine.begin() as conn:
+        conn.execute(PublicPlant.__table__.insert(), rows)
+
+def cpu_per_request(fn):
+    db = SessionLocal()
+    try:
+        fn(db)  # warm-up
+        start = time.process_time()
+        for _ in range(args.requests):
+            body = fn(db)
+        return (time.process_time() - start) / args.requests, body
+    finally:
+        db.close()
+
+def main():
+    populate(args.plants)
+    legacy_cpu, legacy_body = cpu_per_request(legacy_get_public_plants)
+    new_cpu, new_body = cpu_per_request(lambda db: get_public_plants(db).body)
+
+    assert json.loads(legacy_body) == json.loads(new_body), "responses differ"
+
+    print(f"{args.plants} plants, {args.requests} requests each, orjson={'yes' if orjson else 'no'}")
+    print(f"  legacy (decode + jsonable_encoder): {legacy_cpu * 1000:8.2f} ms CPU/request, {len(legacy_body):,} bytes")
+    print(f"  pre-encoded data_json:              {new_cpu * 1000:8.2f} ms CPU/request, {len(new_body):,} bytes")
+    print(f"  speedup: {legacy_cpu / new_cpu:.1f}x")
+
+if __name__ == "__main__":
+    main()
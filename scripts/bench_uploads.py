@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import asyncio
+import shutil
+import argparse
+import tempfile
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.staticfiles import StaticFiles
+from backend.services.uploads import ImmutableUploads, make_webp_variant
+
+BROWSER_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+
+parser = argparse.ArgumentParser(description="Benchmark repeat-view bandwidth and latency for /uploads.")
+parser.add_argument("--image", default=None, help="JPEG/PNG to serve (default: largest file in uploads/).")
+parser.add_argument("--views", type=int, default=10, help="Repeat views of the same image to model (default 10).")
+parser.add_argument("--requests", type=int, default=50, help="Requests to time per case (default 50).")
+args = parser.parse_args()
+
+def pick_image():
+    if args.image:
+        return args.image
+    candidates = [os.path.join("uploads", f) for f in os.listdir("uploads")
+                  if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+    return max(candidates, key=os.path.getsize)
+
+class Response:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+class ASGIClient:
+    """
+    Calls an ASGI app in-process (no httpx), like a mount at /uploads would.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    def get(self, url, headers=None):
+        return self.loop.run_until_complete(self._get(url, headers or {}))
+
+    async def _get(self, url, headers):
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "root_path": "/uploads",
+            "path": url,
+            "raw_path": url.encode(),
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "server": ("testserver", 80),
+        }
+        messages = []
+        request_sent = False
+        response_done = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a real client: disconnect only once the response is complete
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done.set()
+
+        await self.app(scope, receive, send)
+        start = messages[0]
+        response_headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        return Response(start["status"], response_headers, body)
+
+def mean_latency_ms(client, url, headers):
+    client.get(url, headers=headers)  # warm-up
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        response = client.get(url, headers=headers)
+    return (time.perf_counter() - start) / args.requests * 1000, response
+
+def main():
+    source = pick_image()
+    scratch_dir = tempfile.mkdtemp(prefix="upload-bench-")
+    name = os.path.basename(source)
+    shutil.copy(source, os.path.join(scratch_dir, name))
+    make_webp_variant(os.path.join(scratch_dir, name))
+    url = f"/uploads/{name}"
+
+    before = ASGIClient(StaticFiles(directory=scratch_dir))
+    after = ASGIClient(ImmutableUploads(directory=scratch_dir))
+
+    print(f"{name}, {args.views} views, latency over {args.requests} in-process requests")
+    print()
+
+    # Before: no Cache-Control, so every repeat view goes back to the server
+    first = before.get(url, headers={"accept": BROWSER_ACCEPT})
+    etag = first.headers["etag"]
+    revalidate_ms, revalidated = mean_latency_ms(before, url, {"accept": BROWSER_ACCEPT, "if-none-match": etag})
+    full_ms, _ = mean_latency_ms(before, url, {"accept": BROWSER_ACCEPT})
+    print("before (StaticFiles):")
+    print(f"  first view:   {len(first.content):>10,} bytes  {full_ms:6.2f} ms")
+    print(f"  repeat views: {args.views - 1} x revalidation ({revalidated.status_code}, {revalidate_ms:.2f} ms each)"
+          f" or {(args.views - 1) * len(first.content):,} bytes if refetched")
+
+    # After: WebP on first view, then served from cache with no request at all
+    first = after.get(url, headers={"accept": BROWSER_ACCEPT})
+    full_ms, _ = mean_latency_ms(after, url, {"accept": BROWSER_ACCEPT})
+    range_ms, ranged = mean_latency_ms(after, url, {"accept": BROWSER_ACCEPT, "range": "bytes=0-65535"})
+    print("after (ImmutableUploads):")
+    print(f"  first view:   {len(first.content):>10,} bytes  {full_ms:6.2f} ms  ({first.headers['content-type']})")
+    print(f"  repeat views: 0 requests ({first.headers['cache-control']})")
+    print(f"  64 KiB range: {ranged.status_code}, {len(ranged.content):,} bytes  {range_ms:.2f} ms")
+
+    shutil.rmtree(scratch_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+from backend.database import engine, SessionLocal, PublicPlant, dialect_insert, init_db
+from backend.services.stats import rebuild_stats
+from backend.services.serialization import listing_json
+
+DATA_DIR = "data"
+BUNDLE_FILE = os.path.join(DATA_DIR, "all_plants.json")
+SKIP_FILES = {"index.json", "all_plants.json"}
+
+parser = argparse.ArgumentParser(description="Bulk import the local data/ catalogue into the public plants database.")
+parser.add_argument("--bundle", action="store_true", help=f"Read {BUNDLE_FILE} instead of the individual data/*.json files.")
+parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per bulk INSERT ... ON CONFLICT (default 1000).")
+parser.add_argument("--skip-stats", action="store_true", help="Do not rebuild the /api/stats aggregate table afterwards.")
+
+def iter_data_files(data_dir=DATA_DIR):
+    """
+    Yields (plant dict, file stem) from data/*.json one file at a time.
+    """
+    with os.scandir(data_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not entry.name.endswith(".json") or entry.name in SKIP_FILES:
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    yield json.load(f), os.path.splitext(entry.name)[0]
+            except Exception as e:
+                print(f"Warning: Failed to read {entry.name}: {e}")
+
+def iter_bundle(path=BUNDLE_FILE, read_size=1 << 16):
+    """
+    Yields (plant dict, None) from a top-level JSON array without loading the
+    whole file, by decoding one element at a time from a rolling buffer.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                if buffer[pos] == "[":
+                    started = True
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            if pos < len(buffer) and started:
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield obj, None
+                    pos = end
+                    continue
+            if eof:
+                return
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+def plant_filename(plant_data, fallback=None):
+    """
+    The upsert key: the basename of the reference image, as for uploads,
+    or `fallback` (the data file's stem) when the record has no image URL.
+    """
+    url = (plant_data.get("reference_image") or {}).get("url") or ""
+    return os.path.basename(url) or fallback
+
+def parse_date_added(plant_data):
+    value = plant_data.get("date_added")
+    if not value:
+        return datetime.utcnow()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return datetime.utcnow()
+
+def ensure_filename_index():
+    """
+    Databases created before the unique filename index need it for ON CONFLICT.
+    """
+    for index in PublicPlant.__table__.indexes:
+        if index.unique:
+            index.create(bind=engine, checkfirst=True)
+
+def build_upsert():
+    insert = dialect_insert(engine)
+    stmt = insert(PublicPlant.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[PublicPlant.filename],
+        set_={
+            "data": stmt.excluded.data,
+            "data_json": stmt.excluded.data_json,
+            "uploaded_at": stmt.excluded.uploaded_at,
+        },
+    )
+
+def import_plants(plants, chunk_size=1000):
+    """
+    Upserts an iterable of (plant dict, fallback key) pairs in chunks, one
+    transaction per chunk. Returns (rows written, rows skipped).
+    """
+    stmt = build_upsert()
+    written = 0
+    skipped = 0
+    # Keyed by filename: PostgreSQL rejects an ON CONFLICT statement that
+    # touches the same row twice, so the last record for a key wins
+    batch = {}
+
+    def flush():
+        nonlocal written
+        if not batch:
+            return
+        with engine.begin() as conn:
+            conn.execute(stmt, list(batch.values()))
+        written += len(batch)
+        batch.clear()
+
+    for plant_data, fallback in plants:
+        filename = plant_filename(plant_data, fallback)
+        if not filename or plant_data.get("identified_name", "").lower() == "unknown":
+            skipped += 1
+            continue
+        batch[filename] = {
+            "filename": filename,
+            "uploaded_at": parse_date_added(plant_data),
+            "data": plant_data,
+            "data_json": listing_json(plant_data),
+        }
+        if len(batch) >= chunk_size:
+            flush()
+    flush()
+
+    return written, skipped
+
+def main():
+    args = parser.parse_args()
+    init_db()
+    ensure_filename_index()
+
+    source = iter_bundle() if args.bundle else iter_data_files()
+
+    start = time.perf_counter()
+    written, skipped = import_plants(source, chunk_size=max(1, args.chunk_size))
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"Imported {written} plants ({skipped} skipped) in {elapsed:.2f}s ({rate:,.0f} rows/sec).")
+
+    if not args.skip_stats:
+        db: Session = SessionLocal()
+        try:
+            total = rebuild_stats(db)
+            print(f"Rebuilt stats from {total} public plants.")
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.uploads import make_webp_variant, webp_variant_path
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+
+def main():
+    created = 0
+    for filename in sorted(os.listdir(UPLOAD_DIR)):
+        path = os.path.join(UPLOAD_DIR, filename)
+        variant_path = webp_variant_path(path)
+        if variant_path is None or os.path.exists(variant_path):
+            continue
+        if make_webp_variant(path):
+            print(f"Saved WebP variant: {variant_path}")
+            created += 1
+    print(f"Created {created} WebP variants in {UPLOAD_DIR}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Ensure we can import from backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+from backend.database import SessionLocal, init_db
+from backend.services.stats import rebuild_stats
+
+def rebuild():
+    init_db()
+    db: Session = SessionLocal()
+    try:
+        total = rebuild_stats(db)
+        print(f"Successfully rebuilt stats from {total} public plants.")
+    except Exception as e:
+        print(f"Error during stats rebuild: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -3,9 +3,15 @@
 Plant Catalogue Launcher
 Starts both frontend and backend servers and opens the browser.
 Cross-platform (Windows, macOS, Linux)
+
+With --prod, runs only the backend with multiple workers behind a supervisor
+(gunicorn + uvicorn workers when installed, otherwise uvicorn --workers),
+waits for /readyz and shuts down gracefully on SIGTERM.
 """
 
+import argparse
 import subprocess
+import urllib.request
 import webbrowser
 import time
 import sys
@@ -18,6 +24,10 @@ FRONTEND_PORT = 8000
 BACKEND_PORT = 8001
 FRONTEND_URL = f"http://localhost:{FRONTEND_PORT}"
 
+# Production defaults
+GRACEFUL_TIMEOUT = 120  # seconds an in-flight upload may take to finish
+READY_TIMEOUT = 60      # seconds to wait for /readyz after launch
+
 # Store process references for cleanup
 processes = []
 
@@ -37,15 +47,8 @@ def cleanup(signum=None, frame=None):
 signal.signal(signal.SIGINT, cleanup)
 signal.signal(signal.SIGTERM, cleanup)
 
-def main():
-    # Change to script directory
-    script_dir = Path(__file__).parent
-    os.chdir(script_dir)
-    
-    print("🌱 Starting Plant Catalogue...")
-    print("=" * 50)
-    
-    # Determine Python executable
+def find_python():
+    """Return the venv Python executable, exiting if the venv is missing"""
     if sys.platform == "win32":
         python_exe = "venv\\Scripts\\python.exe"
     else:
@@ -57,6 +60,139 @@ def main():
         print("Please run: python3 -m venv venv")
         print("Then: pip install -r requirements.txt")
         sys.exit(1)
+    return python_exe
+
+def has_modules(python_exe, *modules):
+    """Check whether the venv can import the given modules"""
+    result = subprocess.run(
+        [python_exe, "-c", "import " + ", ".join(modules)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return result.returncode == 0
+
+def wait_until_ready(proc, url, timeout=READY_TIMEOUT):
+    """Poll the readiness endpoint until it answers 200 or the server exits"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=2) as resp:
+                if resp.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+def run_production(args):
+    """Run the backend with N workers, readiness gating and graceful shutdown"""
+    python_exe = find_python()
+    workers = args.workers or os.cpu_count() or 1
+    check_host = "127.0.0.1" if args.host in ("0.0.0.0", "::") else args.host
+    ready_url = f"http://{check_host}:{args.port}/readyz"
+    
+    print("🌱 Starting Plant Catalogue backend (production)...")
+    print("=" * 50)
+    
+    # 1. Create tables/columns once, before any worker imports the app
+    print("🗄️  Preparing database schema...")
+    # A database that is down now is not fatal: workers retry it at import
+    # and /readyz reports it, so the service still comes up and recovers
+    schema = subprocess.run([python_exe, "-c", "from backend.database import init_db; init_db()"])
+    if schema.returncode != 0:
+        print("⚠️  Could not prepare the database schema; starting anyway")
+    
+    # 2. Start the supervisor
+    env = dict(
+        os.environ,
+        BACKEND_HOST=args.host,
+        BACKEND_PORT=str(args.port),
+        WEB_CONCURRENCY=str(workers),
+        PRELOAD_APP="1" if args.preload else "0",
+        GRACEFUL_TIMEOUT=str(GRACEFUL_TIMEOUT),
+    )
+    if sys.platform != "win32" and has_modules(python_exe, "gunicorn", "uvicorn_worker"):
+        cmd = [python_exe, "-m", "gunicorn", "-c", "backend/gunicorn_conf.py", "backend.main:app"]
+        reload_hint = "SIGHUP reloads workers gracefully"
+    else:
+        if args.preload:
+            print("⚠️  --preload needs gunicorn and uvicorn-worker; each worker will import the app")
+        cmd = [
+            python_exe, "-m", "uvicorn", "backend.main:app",
+            "--host", args.host,
+            "--port", str(args.port),
+            "--workers", str(workers),
+            "--timeout-graceful-shutdown", str(GRACEFUL_TIMEOUT),
+        ]
+        reload_hint = "SIGHUP restarts workers"
+    
+    print(f"🔧 Starting {workers} workers on {args.host}:{args.port}...")
+    # Own process group, so a terminal Ctrl+C reaches the supervisor only
+    # through the graceful SIGTERM forwarded below
+    backend_proc = subprocess.Popen(cmd, env=env, start_new_session=(sys.platform != "win32"))
+    
+    # Signal handlers only forward; the loop below does the waiting
+    stop_requested_at = []
+    
+    def shutdown(signum=None, frame=None):
+        if not stop_requested_at:
+            print("\n🛑 Draining in-flight requests...")
+            stop_requested_at.append(time.time())
+            backend_proc.terminate()
+    
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: backend_proc.send_signal(signal.SIGHUP))
+    
+    # 3. Report readiness
+    if wait_until_ready(backend_proc, ready_url):
+        print("=" * 50)
+        print("✅ Backend is ready!")
+        print(f"   Liveness:  http://{check_host}:{args.port}/healthz")
+        print(f"   Readiness: {ready_url}")
+        print(f"   {reload_hint}, SIGTERM drains and stops")
+        print("=" * 50)
+    elif not stop_requested_at and backend_proc.poll() is None:
+        # Keep serving: /healthz is up and /readyz flips once the database is
+        # reachable. Stopping here would exit 0 and defeat Restart=on-failure
+        print(f"⚠️  Backend is not ready yet at {ready_url}; still running")
+    
+    # 4. Stay in the foreground so systemd tracks the supervisor
+    while backend_proc.poll() is None:
+        time.sleep(0.5)
+        if stop_requested_at and time.time() - stop_requested_at[0] > GRACEFUL_TIMEOUT + 15:
+            backend_proc.kill()
+    
+    if stop_requested_at:
+        print("✅ Backend stopped")
+        sys.exit(0)
+    print(f"\n⚠️  Backend exited with code {backend_proc.returncode}")
+    sys.exit(backend_proc.returncode)
+
+def main():
+    parser = argparse.ArgumentParser(description="Plant Catalogue launcher")
+    parser.add_argument("--prod", action="store_true", help="Run only the backend with multiple workers")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes in --prod (default: CPU count)")
+    parser.add_argument("--preload", action="store_true", help="Import the app once and fork workers from it (gunicorn only)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address in --prod (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=BACKEND_PORT, help=f"Backend port in --prod (default: {BACKEND_PORT})")
+    args = parser.parse_args()
+    
+    # Change to script directory
+    script_dir = Path(__file__).parent
+    os.chdir(script_dir)
+    
+    if args.prod:
+        run_production(args)
+        return
+    
+    print("🌱 Starting Plant Catalogue...")
+    print("=" * 50)
+    
+    python_exe = find_python()
     
     try:
         # Start Backend (FastAPI)